@@ -4,9 +4,11 @@ from selenium.webdriver.common.by import By
 import ctypes
 
 from selenium.webdriver.support.ui import Select
+from selenium.webdriver.support.ui import WebDriverWait
 from selenium.common.exceptions import NoSuchElementException
+from selenium.common.exceptions import TimeoutException
+from selenium.common.exceptions import NoSuchWindowException
 
-import time
 import logging
 import configparser
 
@@ -22,6 +24,11 @@ def message_box(title, text, style):
 
 msg_title = "Что-то пошло не так, скрипт будет завершен..."
 
+# reads the status of the SOC, it is the text following the CertificateState label on the SOC details page
+# item_xpath = "//label[@for='CertificateState']/.."
+SOC_status_js = """return document.evaluate("//label[@for='CertificateState']/following-sibling::text()", document, """ \
+                """null, XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue.textContent;"""
+
 def switch_lang_if_not_eng():
     xpath = "//img[contains(@src,'/images/gb.jpg')]"
     try:
@@ -35,18 +42,59 @@ def switch_lang_if_not_eng():
         # FUTURE: switch to English here
         return
 
+def check_SOC_is_available():
+    # Locked and Access Denied markers are looked up with one find_elements call,
+    # the page is opened only if neither of them is present
+    xpath = "//li[contains(text(), 'Locked')] | //h1[text()='Access Denied']"
+    for element in driver.find_elements(By.XPATH, xpath):
+        if element.tag_name == 'li':
+            message_box('SOC is locked, the script will be terminated', element.text, 0)
+        else:
+            message_box(element.text, f'Access denied, probably SOC {SOC_id} is archived or in improper state', 0)
+        quit()
+
+def wait_for_ajax_complete():
+    # Kendo widgets of the page are filled by jQuery ajax requests,
+    # the page is settled when none of them is running
+    try:
+        ajax_wait.until(lambda d: d.execute_script(
+            "return document.readyState === 'complete' && (!window.jQuery || jQuery.active === 0);"))
+    except TimeoutException:
+        logging.info("wait_for_ajax_complete: ajax requests are still running after %s seconds", ajax_timeout)
+
 config = configparser.ConfigParser()
 config.read('autoPoints.ini')
 
 user_name = config['Settings']['user_name']
 password = config['Settings']['password']
 
-# number of SOC
-SOC_id = config['Settings']['SOC_id']
+# without the credentials the login would fail and the error would come later from another page,
+# they are checked before the browser is started
+if not user_name.strip() or not password:
+    message_box(msg_title, "Не указаны user_name / password в autoPoints.ini", 0)
+    quit()
+
+# number of SOC, without it there is nothing to open, it is checked before the browser is started
+SOC_id = config['Settings']['SOC_id'].strip()
+if not SOC_id:
+    message_box(msg_title, "Не указан SOC_id в autoPoints.ini", 0)
+    quit()
 
 SOC_roles = config['Roles']['SOC_roles'].split(',')
 
-driver: WebDriver = webdriver.Chrome()
+# the browser is not headless and keeps its usual profile because the user has to press Confirm in it
+chrome_options = webdriver.ChromeOptions()
+# driver.get() returns as soon as the DOM is built, the pages where scripts must have finished
+# are waited for explicitly with wait_for_ajax_complete()
+chrome_options.page_load_strategy = 'eager'
+driver: WebDriver = webdriver.Chrome(options=chrome_options)
+# explicit waits are used where waiting is required, implicit waits would only
+# slow down every find_element that is expected to fail (Locked, Access Denied, etc.)
+driver.implicitly_wait(0)
+
+# the wait is created once and reused, it polls every 0.1 s instead of the default 0.5 s
+ajax_timeout = 10
+ajax_wait = WebDriverWait(driver, ajax_timeout, poll_frequency=0.1)
 
 driver.get('http://eptw.sakhalinenergy.ru/')
 driver.maximize_window()
@@ -54,10 +102,24 @@ driver.maximize_window()
 # check if English is chosen, otherwise switch the language
 switch_lang_if_not_eng()
 
-# login
-driver.find_element(By.ID, "UserName").send_keys(user_name)
-driver.find_element(By.ID, "Password").send_keys(password)
-driver.find_element(By.XPATH, "//button[@type='submit' and @class='panel-line-btn btn-sm k-button k-primary']").click()
+# login, both credentials are set in one call, the script returns false if the login form is not found
+login_js = """
+    var fields = [document.getElementById('UserName'), document.getElementById('Password')];
+    if (!fields[0] || !fields[1]) {
+        return false;
+    }
+    for (var i = 0; i < fields.length; i++) {
+        fields[i].value = arguments[i];
+        fields[i].dispatchEvent(new Event('input', {bubbles: true}));
+        fields[i].dispatchEvent(new Event('change', {bubbles: true}));
+    }
+    return true;
+"""
+if not driver.execute_script(login_js, str(user_name), str(password)):
+    logging.info("login: UserName or Password field is not found")
+    message_box(msg_title, "Не найдены поля UserName / Password на странице входа", 0)
+    quit()
+driver.find_element(By.CSS_SELECTOR, "button[type='submit'][class='panel-line-btn btn-sm k-button k-primary']").click()
 
 SOC_view_base_link = "http://eptw.sakhalinenergy.ru/Soc/Details/"
 driver.get(SOC_view_base_link + SOC_id) # http://eptw.sakhalinenergy.ru/Soc/Details/1458894
@@ -65,14 +127,14 @@ driver.get(SOC_view_base_link + SOC_id) # http://eptw.sakhalinenergy.ru/Soc/Deta
 good_statuses = ['accepted for apply', 'requested for removal', 'applied, not verified', 'removed, not verified']
 
 try: 
-    # item_xpath = "//label[@for='CertificateState']/.."
-    cmd = """return document.evaluate("//label[@for='CertificateState']/following-sibling::text()", document, null, """ \
-          """ XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue.textContent;"""
-
-    SOC_status = driver.execute_script(cmd).strip().lower()
+    SOC_status = driver.execute_script(SOC_status_js).strip().lower()
 
+except NoSuchWindowException as e:
+    # the browser window is closed, there is nobody to show the message to
+    logging.info("%s", type(e).__name__)
+    quit()
 except Exception as e:
-    logging.info(f"{str(e)}")
+    logging.info("%s", e)
     message_box(msg_title, f"{str(e)}", 0)
     quit()
 
@@ -83,33 +145,22 @@ if SOC_status not in good_statuses:
 for SOC_role in SOC_roles:
     driver.get(r"http://eptw.sakhalinenergy.ru/User/ChangeRole")
     input_text = driver.find_element(By.ID, 'CurrentRoleName')
-    driver.execute_script(f'arguments[0].value="{SOC_role}"', input_text)
+    # the role is passed as an argument, so the script text is the same for every role
+    driver.execute_script('arguments[0].value = arguments[1];', input_text, SOC_role)
     # driver.execute_script("arguments[0].style.display = 'block';", input_text)
+    # the handler of the Confirm button is attached by the page scripts
+    wait_for_ajax_complete()
     driver.find_element(By.ID, 'ConfirmHeader').click()
 
     # navigate to Edit Overrides page
     SOC_update_base_link = "http://eptw.sakhalinenergy.ru/Soc/UpdateOverride/"
     driver.get(SOC_update_base_link + SOC_id) #example: http://eptw.sakhalinenergy.ru/Soc/UpdateOverride/1458894
 
-    # check if the SOC is locked
-    try:
-        li_locked = driver.find_element(By.XPATH, "//li[contains(text(), 'Locked')]")
-        message_box('SOC is locked, the script will be terminated', li_locked.text, 0)
-        quit()
-    except NoSuchElementException:
-        # the pass is put here on purpose
-        pass
-
-    # check for Access Denied
-    try:
-        access_denied = driver.find_element(By.XPATH, "//h1[text()='Access Denied']")
-        message_box(access_denied.text, f'Access denied, probably SOC {SOC_id} is archived or in improper state', 0)
-        quit()
-    except NoSuchElementException:
-        # the pass is put here on purpose
-        pass
+    # the page is loaded eagerly, the Locked marker and the state selects are ready only when its scripts have finished
+    wait_for_ajax_complete()
 
-    time.sleep(1)
+    # check if the SOC is locked or access is denied
+    check_SOC_is_available()
 
     try:
         # item_xpath = f"//select[@id='CurrentStateSelect']"
@@ -118,7 +169,7 @@ for SOC_role in SOC_roles:
             drop = Select(sel_item)
             drop.select_by_index(1) # Applied
     except NoSuchElementException as e:
-        logging.info(f"{str(e)}")
+        logging.info("%s", e)
         message_box(msg_title, f"{str(e)}", 0)
         quit()
 
@@ -1,14 +1,10 @@
 from selenium import webdriver
 from selenium.webdriver.chrome.webdriver import WebDriver
 from selenium.webdriver.common.by import By
-from selenium.webdriver.support import expected_conditions as ec
 import ctypes
 
 from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.common.action_chains import ActionChains
 from selenium.webdriver.support import expected_conditions
-from selenium.webdriver.common.keys import Keys
-from selenium.webdriver.common.desired_capabilities import DesiredCapabilities
 from selenium.common.exceptions import NoSuchElementException
 from selenium.common.exceptions import TimeoutException
 from selenium.common.exceptions import ElementNotInteractableException
@@ -16,6 +12,7 @@ from selenium.common.exceptions import NoSuchWindowException
 from selenium.common.exceptions import StaleElementReferenceException
 
 import time
+from collections import namedtuple
 import openpyxl as xl
 
 import logging
@@ -32,6 +29,11 @@ def message_box(title, text, style):
 
 msg_title = "Что-то пошло не так, скрипт будет завершен..."
 
+# one row of the 'overrides' sheet, fields are in the order of the sheet columns
+Override = namedtuple('Override', ['TagNumber', 'Description', 'Comment', 'OverrideType', 'OverrideMethod',
+                                   'AppliedState', 'AdditionalValueAppliedState', 'RemovedState',
+                                   'AdditionalValueRemovedState'])
+
 def switch_lang_if_not_eng():
     xpath = "//img[contains(@src,'/images/gb.jpg')]"
     try:
@@ -45,32 +47,69 @@ def switch_lang_if_not_eng():
         # FUTURE: switch to English here
         return
 
-def is_menu_item_already_selected(parent_id, menu_item_text):
-    # find <li> element with particular text and class containing 'k-item' and 'k-state-selected'
+def check_SOC_is_available():
+    # Locked and Access Denied markers are looked up with one find_elements call,
+    # the page is opened only if neither of them is present
+    xpath = "//li[contains(text(), 'Locked')] | //h1[text()='Access Denied']"
+    for element in driver.find_elements(By.XPATH, xpath):
+        if element.tag_name == 'li':
+            message_box('SOC is locked, the script will be terminated', element.text, 0)
+        else:
+            message_box(element.text, f'Access denied, probably SOC {SOC_id} is archived or in improper state', 0)
+        quit()
+
+def menu_item_xpath(parent_id, menu_item_text, selected=False):
+    # <li> element with particular text and class containing 'k-item' (and 'k-state-selected' if required),
     # that element must have parent tag <ul> with id=parent_id
-    item_xpath = f"//ul[@id='{parent_id}']/li[text()='{menu_item_text}' and contains(@class ,'k-item') and "\
-                  "contains(@class ,'k-state-selected')]"
+    item_xpath = f"//ul[@id='{parent_id}']/li[text()='{menu_item_text}' and contains(@class ,'k-item')"
+    if selected:
+        item_xpath += " and contains(@class ,'k-state-selected')"
+    return item_xpath + "]"
+
+def is_menu_item_already_selected(parent_id, menu_item_text):
+    item_xpath = menu_item_xpath(parent_id, menu_item_text, selected=True)
     try:
         driver.find_element(By.XPATH, item_xpath)
-        logging.info(f"is_menu_item_already_selected: item_xpath for '{menu_item_text}', '{parent_id}' is: '{item_xpath}'")
+        logging.debug("is_menu_item_already_selected: item_xpath for '%s', '%s' is: '%s'", menu_item_text, parent_id, item_xpath)
         return True
     except NoSuchElementException:
         return False
 
+def wait_for_ajax_complete():
+    # Kendo widgets of the page are filled by jQuery ajax requests,
+    # the page is settled when none of them is running; returns False if it is not settled after ajax_timeout
+    try:
+        ajax_wait.until(lambda d: d.execute_script(
+            "return document.readyState === 'complete' && (!window.jQuery || jQuery.active === 0);"))
+        return True
+    except TimeoutException:
+        logging.info("wait_for_ajax_complete: ajax requests are still running after %s seconds", ajax_timeout)
+        return False
+
+# the overrides added before a stale element are kept on the page, so the user can still confirm them
+stale_element_message = "Исключение {exception_name}, можно нажать Confirm, чтобы сохранить те точки, " \
+                        "которые уже добавлены, и запустить скрипт снова (предвариельно удалив уже " \
+                        "добавленные точки из overrides.xslx)"
+
+# errors of select_menu_item: exception -> text of the message box shown before the script is terminated,
+# None if no message is shown (the browser window is closed)
+select_menu_item_errors = {
+    NoSuchElementException: "{exception_name}: {item_xpath}",
+    TimeoutException: "{exception_name}: {item_xpath}",
+    ElementNotInteractableException: "{exception_name}: {item_xpath}",
+    NoSuchWindowException: None,
+    StaleElementReferenceException: stale_element_message,
+}
+
 def select_menu_item(parent_id, menu_item_text):
-    # find <li> element with particular text and class containing 'k-item'
-    # that element must have parent tag <ul> with id=parent_id
+    item_xpath = menu_item_xpath(parent_id, menu_item_text)
     try:
-        item_xpath = f"//ul[@id='{parent_id}']/li[text()='{menu_item_text}' and contains(@class ,'k-item')]"
-        logging.info(f"select_menu_item: item_xpath for '{menu_item_text}', '{parent_id}' is: '{item_xpath}'")        
-        ignored_exceptions = (NoSuchElementException, StaleElementReferenceException)
-        element = WebDriverWait(driver, 5, ignored_exceptions=ignored_exceptions).until(\
-            expected_conditions.element_to_be_clickable((By.XPATH, item_xpath)))
-
-        # this delay might be configurable, it is not required, but for some reason some menu items
-        # are selected incorrectly without raising NoSuchElementException for the next menu
-        # because dependencies become broken
-        time.sleep(time_delay)
+        logging.debug("select_menu_item: item_xpath for '%s', '%s' is: '%s'", menu_item_text, parent_id, item_xpath)
+        # some menu items were selected incorrectly without raising NoSuchElementException for the next menu
+        # because dependencies became broken: the items of a dependent menu are loaded by the cascade
+        # of the previous one, choose_menu_item() waits for it before the menu is opened, so the item
+        # found here belongs to the finished list and is not replaced before it is clicked
+        element = menu_item_wait.until(expected_conditions.element_to_be_clickable((By.XPATH, item_xpath)))
 
         # test variant via JavaScript
         driver.execute_script("arguments[0].click();", element)
@@ -78,57 +117,206 @@ def select_menu_item(parent_id, menu_item_text):
         # main variant of clicking
         # element.click()
 
-    except NoSuchElementException:
-        logging.info(f"select_menu_item: NoSuchElementException, XPATH = '{item_xpath}'")
-        message_box(msg_title, 'NoSuchElementException: ' + item_xpath, 0)
-        quit()
-    except TimeoutException as e:
+    except tuple(select_menu_item_errors) as e:
         exception_name = type(e).__name__
-        logging.info(f"select_menu_item: {exception_name}, XPATH = '{item_xpath}'")
-        message_box(msg_title, f"{exception_name}: {item_xpath}", 0)
+        logging.info("select_menu_item: %s, XPATH = '%s'", exception_name, item_xpath)
+        message = next(text for error, text in select_menu_item_errors.items() if isinstance(e, error))
+        if message is not None:
+            message_box(msg_title, message.format(exception_name=exception_name, item_xpath=item_xpath), 0)
         quit()
-    except ElementNotInteractableException as e:
+
+# menus of the Edit Overrides page: listbox ID -> XPATH of the element which opens the menu
+menu_XPATHs = {listbox_id: f'//span[@aria-owns="{listbox_id}"]'
+               for listbox_id in ('OverrideTypeId_listbox', 'OverrideMethodId_listbox',
+                                  'OverrideAppliedStateId_listbox', 'OverrideRemovedStateId_listbox')}
+
+def choose_menu_item(listbox_id, menu_item_text):
+    # the selection of this menu may still be changed by the cascade of the previous one,
+    # so it is read only when no ajax request is running; the delay from the Settings sheet is not a fixed
+    # pause anymore, it is an extra time for slow servers which is given only if the requests are still running
+    if not wait_for_ajax_complete() and time_delay > 0:
+        time.sleep(time_delay)
+    # is_menu_item_already_selected function checks if the menu item
+    # has already been chosen automatically, then the menu is not opened at all
+    if is_menu_item_already_selected(listbox_id, menu_item_text):
+        return
+    menu_xpath = menu_XPATHs[listbox_id]
+    try:
+        driver.find_element(By.XPATH, menu_xpath).click()
+    except NoSuchElementException as e:
         exception_name = type(e).__name__
-        logging.info(f"select_menu_item: {exception_name}, XPATH = '{item_xpath}'")
-        message_box(msg_title, f"{exception_name}: {item_xpath}", 0)
+        logging.info("%s click(): %s, XPATH = '%s'", listbox_id, exception_name, menu_xpath)
+        message_box(msg_title, f"{exception_name}: {menu_xpath}", 0)
         quit()
     except NoSuchWindowException as e:
         exception_name = type(e).__name__
-        logging.info(f"select_menu_item: {exception_name}, XPATH = '{item_xpath}'")
-        quit()
-    except StaleElementReferenceException as e:
-        exception_name = type(e).__name__
-        logging.info(f"select_menu_item: {exception_name}, XPATH = '{item_xpath}'")
-        message_box(msg_title, f"Исключение {exception_name}, можно нажать Confirm, чтобы сохранить те точки, "\
-                                "которые уже добавлены, и запустить скрипт снова (предвариельно удалив уже "\
-                                "добавленные точки из overrides.xslx)", 0)
+        logging.info("%s click(): %s, XPATH = '%s'", listbox_id, exception_name, menu_xpath)
         quit()
+    select_menu_item(listbox_id, menu_item_text)
+
+# after Add the page clears the values of the Edit Overrides form, but its text fields and the Add button
+# stay the same elements, so they are looked up once and the references are reused for the whole import
+page_elements = {}
+
+def find_page_element(element_id):
+    element = page_elements.get(element_id)
+    if element is None:
+        element = page_elements[element_id] = driver.find_element(By.ID, element_id)
+    return element
+
+# the values are set in one call instead of typing them with send_keys key by key, input and change events
+# are raised for the page scripts; hidden or disabled fields are not filled, like with send_keys,
+# the script returns the index of such a field or -1 if all the fields are filled
+fill_text_fields_js = """
+    var fields = arguments[0], values = arguments[1];
+    for (var i = 0; i < fields.length; i++) {
+        if (fields[i].disabled || fields[i].offsetParent === null) {
+            return i;
+        }
+    }
+    for (var i = 0; i < fields.length; i++) {
+        fields[i].value = values[i];
+        fields[i].dispatchEvent(new Event('input', {bubbles: true}));
+        fields[i].dispatchEvent(new Event('change', {bubbles: true}));
+    }
+    return -1;
+"""
+
+def set_field_values(field_values):
+    field_ids = list(field_values)
+    fields = [find_page_element(field_id) for field_id in field_ids]
+    values = [str(field_values[field_id]) for field_id in field_ids]
+    index = driver.execute_script(fill_text_fields_js, fields, values)
+    if index >= 0:
+        raise ElementNotInteractableException(f"element with ID '{field_ids[index]}' is hidden or disabled")
+
+def fill_text_fields(field_values):
+    # field_values: {field ID: value}, all the fields are filled in one driver call,
+    # empty values (None) are skipped and nothing is sent to the driver if all of them are empty
+    field_values = {field_id: value for field_id, value in field_values.items() if value is not None}
+    if not field_values:
+        return
+    try:
+        set_field_values(field_values)
+    except StaleElementReferenceException:
+        # the page has rebuilt a field, the cached references are dropped and the fields are looked up again
+        for field_id in field_values:
+            page_elements.pop(field_id, None)
+        set_field_values(field_values)
+
+def quit_on_page_error(e):
+    # a missing, hidden, disabled or again stale element stops the import the same way for every element of the form
+    logging.info("%s", e)
+    if isinstance(e, StaleElementReferenceException):
+        message_box(msg_title, stale_element_message.format(exception_name=type(e).__name__), 0)
+    else:
+        message_box(msg_title, f"{str(e)}", 0)
+    quit()
 
+def fill_text_fields_or_quit(field_values):
+    try:
+        fill_text_fields(field_values)
+    except (NoSuchElementException, ElementNotInteractableException, StaleElementReferenceException) as e:
+        quit_on_page_error(e)
 
-wb = xl.load_workbook('overrides.xlsx')
+def click_button(button_id):
+    try:
+        find_page_element(button_id).click()
+    except StaleElementReferenceException:
+        page_elements.pop(button_id, None)
+        find_page_element(button_id).click()
 
-sheet = wb['Settings']
-user_name = sheet.cell(1, 2).value
-password = sheet.cell(2, 2).value
-time_delay = float(sheet.cell(4, 2).value)
+def click_button_or_quit(button_id):
+    try:
+        click_button(button_id)
+    except (NoSuchElementException, ElementNotInteractableException, StaleElementReferenceException) as e:
+        quit_on_page_error(e)
+
+def validate_overrides(overrides):
+    # check every override before the browser is started, so rows with missing
+    # mandatory fields are reported at once instead of failing in the middle of the import
+    required_fields = ("TagNumber", "Description", "OverrideType", "OverrideMethod", "AppliedState")
+    valid, invalid = [], []
+    for override in overrides:
+        missing = [field for field in required_fields if getattr(override, field) is None]
+        if missing:
+            invalid.append((override, missing))
+        else:
+            valid.append(override)
+    return valid, invalid
+
+def cell_text(value):
+    # menu items are matched by exact text in XPath, so stray spaces from the sheet are removed once here;
+    # empty cells become None, so optional fields are checked only for None during the import
+    if isinstance(value, str):
+        return value.strip() or None
+    return value
+
+
+# the workbook is only read, so it is opened in read-only mode, rows are streamed
+# as plain values instead of building the whole workbook with Cell objects in memory
+wb = xl.load_workbook('overrides.xlsx', read_only=True, data_only=True)
+try:
+    sheet = wb['Settings']
+    user_name = sheet.cell(1, 2).value
+    password = sheet.cell(2, 2).value
+    time_delay = float(sheet.cell(4, 2).value)
+
+    sheet = wb['overrides']
+    # some programs save a wrong dimension of the sheet, in read-only mode it would cut the rows off,
+    # so the rows are read until the end of the sheet data instead
+    sheet.reset_dimensions()
+
+    list_of_overrides = []
+    for values in sheet.iter_rows(min_row=2, max_col=9, values_only=True):
+        if cell_text(values[0]) is None:
+            break
+        list_of_overrides.append(Override._make(map(cell_text, values)))
+
+    # number of SOC
+    SOC_id = cell_text(sheet.cell(1, 12).value)
+finally:
+    # a read-only workbook keeps the file open until it is closed
+    wb.close()
+
+# without the number of SOC there is nothing to open, it is checked before the browser is started
+if SOC_id is None:
+    message_box(msg_title, "Не указан номер SOC (ячейка L1 листа overrides)", 0)
+    quit()
+SOC_id = str(SOC_id)
 
-sheet = wb['overrides']
+# empty credentials would be submitted as the text "None", they are checked before the browser is started too
+if cell_text(user_name) is None or cell_text(password) is None:
+    message_box(msg_title, "Не указаны user_name / password (ячейки B1 и B2 листа Settings)", 0)
+    quit()
 
-list_of_overrides = []
-for row in range(2, sheet.max_row + 1):
-    if sheet.cell(row, 1).value in (None, ""):
-        break
-    xlsx_override = {"TagNumber": sheet.cell(row, 1).value, "Description": sheet.cell(row, 2).value,
-                     "OverrideType": sheet.cell(row, 4).value, "OverrideMethod": sheet.cell(row, 5).value,
-                     "Comment": sheet.cell(row, 3).value, "AppliedState": sheet.cell(row, 6).value,
-                     "AdditionalValueAppliedState": sheet.cell(row, 7).value, "RemovedState": sheet.cell(row, 8).value,
-                     "AdditionalValueRemovedState": sheet.cell(row, 9).value}
-    list_of_overrides.append(xlsx_override)
+list_of_overrides, invalid_overrides = validate_overrides(list_of_overrides)
+if invalid_overrides:
+    for override, missing in invalid_overrides:
+        logging.info("validate_overrides: '%s' is skipped, missing fields: %s", override.TagNumber, ', '.join(missing))
+    skipped_tags = ', '.join(str(override.TagNumber) for override, _ in invalid_overrides)
+    message_box('WARNING!!!', f"Эти точки будут пропущены, не заполнены обязательные поля: {skipped_tags}", 0)
 
-# number of SOC
-SOC_id = str(sheet.cell(1, 12).value)
+# nothing is left to add, the browser is not started at all
+if not list_of_overrides:
+    message_box(msg_title, "Нет точек для добавления (лист overrides пуст или ни одна точка не заполнена полностью)", 0)
+    quit()
 
-driver: WebDriver = webdriver.Chrome()
+# the browser is not headless and keeps its usual profile because the user has to press Confirm in it
+chrome_options = webdriver.ChromeOptions()
+# driver.get() returns as soon as the DOM is built, the pages where scripts must have finished
+# are waited for explicitly with wait_for_ajax_complete()
+chrome_options.page_load_strategy = 'eager'
+driver: WebDriver = webdriver.Chrome(options=chrome_options)
+# explicit waits are used where waiting is required, implicit waits would only
+# slow down every find_element that is expected to fail (Locked, Access Denied, etc.)
+driver.implicitly_wait(0)
+
+# the waits are created once and reused, they poll every 0.1 s instead of the default 0.5 s
+ajax_timeout = 10
+ajax_wait = WebDriverWait(driver, ajax_timeout, poll_frequency=0.1)
+menu_item_wait = WebDriverWait(driver, 5, poll_frequency=0.1,
+                               ignored_exceptions=(NoSuchElementException, StaleElementReferenceException))
 
 driver.get('http://eptw.sakhalinenergy.ru/')
 driver.maximize_window()
@@ -136,129 +324,90 @@ driver.maximize_window()
 # check if English is chosen, otherwise switch the language
 switch_lang_if_not_eng()
 
-# login
-driver.find_element(By.ID, "UserName").send_keys(user_name)
-driver.find_element(By.ID, "Password").send_keys(password)
-driver.find_element(By.XPATH, "//button[@type='submit' and @class='panel-line-btn btn-sm k-button k-primary']").click()
+# login, both credentials are set in one call, the script returns false if the login form is not found
+login_js = """
+    var fields = [document.getElementById('UserName'), document.getElementById('Password')];
+    if (!fields[0] || !fields[1]) {
+        return false;
+    }
+    for (var i = 0; i < fields.length; i++) {
+        fields[i].value = arguments[i];
+        fields[i].dispatchEvent(new Event('input', {bubbles: true}));
+        fields[i].dispatchEvent(new Event('change', {bubbles: true}));
+    }
+    return true;
+"""
+if not driver.execute_script(login_js, str(user_name), str(password)):
+    logging.info("login: UserName or Password field is not found")
+    message_box(msg_title, "Не найдены поля UserName / Password на странице входа", 0)
+    quit()
+driver.find_element(By.CSS_SELECTOR, "button[type='submit'][class='panel-line-btn btn-sm k-button k-primary']").click()
 
 # navigate to Edit Overrides page
 SOC_base_link = "http://eptw.sakhalinenergy.ru/SOC/EditOverrides/"
 driver.get(SOC_base_link + SOC_id) #example: http://eptw.sakhalinenergy.ru/SOC/EditOverrides/1489636
 
-# check if the SOC is locked
-try:
-    li_locked = driver.find_element(By.XPATH, "//li[contains(text(), 'Locked')]")
-    message_box('SOC is locked, the script will be terminated', li_locked.text, 0)
-    quit()
-except NoSuchElementException:
-    # the pass is put here on purpose
-    pass
+# the page is loaded eagerly, the Locked marker and the Kendo menus are ready only when its scripts have finished
+wait_for_ajax_complete()
+
+# check if the SOC is locked or access is denied
+check_SOC_is_available()
 
-# check for Access Denied
+# the fields that are always on the page are looked up once here, so the first override
+# does not pay for them and a changed page is reported before anything is filled
 try:
-    access_denied = driver.find_element(By.XPATH, "//h1[text()='Access Denied']")
-    message_box(access_denied.text, f'Access denied, probably SOC {SOC_id} is archived or in improper state', 0)
+    for element_id in ("TagNumber", "Description", "Comment", "AddOverrideBtn"):
+        find_page_element(element_id)
+except NoSuchElementException as e:
+    logging.info("%s", e)
+    message_box(msg_title, f"{str(e)}", 0)
     quit()
-except NoSuchElementException:
-    # the pass is put here on purpose
-    pass
 
 
-for override in list_of_overrides:
-    # print Tag Number and Description
-    try:
-        driver.find_element(By.ID, "TagNumber").send_keys(override["TagNumber"])
-        driver.find_element(By.ID, "Description").send_keys(override["Description"])
-    except NoSuchElementException as e:
-        logging.info(f"{str(e)}")
-        message_box(msg_title, f"{str(e)}", 0)
-        quit()
+# progress is logged about 50 times per import, not after every override
+total_count = len(list_of_overrides)
+log_every = max(1, total_count // 50)
 
-    # click override type menu and select override type item
-    OverrideTypeIdMenu_XPATH = '//span[@aria-owns="OverrideTypeId_listbox"]'
-    try:
-        driver.find_element(By.XPATH, OverrideTypeIdMenu_XPATH).click()
-    except NoSuchElementException as e:
-        exception_name = type(e).__name__
-        logging.info(f"OverrideTypeId_listbox click(): {exception_name}, XPATH = '{OverrideTypeIdMenu_XPATH}'")
-        message_box(msg_title, f"{exception_name}: {OverrideTypeIdMenu_XPATH}", 0)
-        quit()
-    except NoSuchWindowException:
-        quit()
-    select_menu_item('OverrideTypeId_listbox', override["OverrideType"])
+for index, override in enumerate(list_of_overrides, 1):
+    # print Tag Number and Description
+    fill_text_fields_or_quit({"TagNumber": override.TagNumber, "Description": override.Description})
 
-    # click override method menu and select override method item
-    # is_menu_item_already_selected function checks if the menu item
-    # has already been chosen automatically
-    if not is_menu_item_already_selected('OverrideMethodId_listbox', override["OverrideMethod"]):
-        OverrideMethodMenu_XPATH = '//span[@aria-owns="OverrideMethodId_listbox"]'
-        try:
-            driver.find_element(By.XPATH, OverrideMethodMenu_XPATH).click()
-        except NoSuchElementException as e:
-            exception_name = type(e).__name__
-            logging.info(f"OverrideMethodId_listbox click(): {exception_name}, XPATH = '{OverrideMethodMenu_XPATH}'")
-            message_box(msg_title, f'{exception_name}: {OverrideMethodMenu_XPATH}', 0)
-            quit()
-        except NoSuchWindowException as e:            
-            exception_name = type(e).__name__
-            logging.info(f"OverrideMethodId_listbox click(): {exception_name}, XPATH = '{OverrideMethodMenu_XPATH}'")
-            quit()
-        select_menu_item('OverrideMethodId_listbox', override["OverrideMethod"])
+    # select override type, then override method, their cascades define the items of the state menus;
+    # a menu is skipped only if the item is still selected after Add, the selection is read from the page,
+    # so a menu reset by the page is opened as usual; selecting the same item again would only repeat
+    # the cascade of the dependent menus
+    choose_menu_item('OverrideTypeId_listbox', override.OverrideType)
+    choose_menu_item('OverrideMethodId_listbox', override.OverrideMethod)
 
     # print Comment
-    if override["Comment"] is not None:
-        driver.find_element(By.ID, "Comment").send_keys(override["Comment"])
+    fill_text_fields_or_quit({"Comment": override.Comment})
 
-    # click applied state menu and select the required item
-    AppliedStateMenu_XPATH = '//span[@aria-owns="OverrideAppliedStateId_listbox"]'
-    try:
-        driver.find_element(By.XPATH, AppliedStateMenu_XPATH).click()
-    except NoSuchElementException as e:
-        exception_name = type(e).__name__
-        logging.info(f"OverrideAppliedStateId_listbox click(): {exception_name}, XPATH = '{AppliedStateMenu_XPATH}'")
-        message_box(msg_title, f'exception_name: {AppliedStateMenu_XPATH}', 0)
-        quit()
-    except NoSuchWindowException as e:
-        exception_name = type(e).__name__
-        logging.info(f"OverrideAppliedStateId_listbox click(): {exception_name}, XPATH = '{AppliedStateMenu_XPATH}'")
-        quit()
-    select_menu_item('OverrideAppliedStateId_listbox', override['AppliedState'])
+    # select applied state
+    choose_menu_item('OverrideAppliedStateId_listbox', override.AppliedState)
 
     # AdditionalValueAppliedState
-    if override["AdditionalValueAppliedState"] is not None:
-        try:
-            driver.find_element(By.ID, "AdditionalValueAppliedState").send_keys(override["AdditionalValueAppliedState"])
-        except ElementNotInteractableException as e:
-            exception_name = type(e).__name__
-            logging.info(f"send_keys() for element with ID 'AdditionalValueAppliedState': {exception_name}")
-            quit()
-            
-    # click Removed state menu and select the required item
-    # 1. it is not required if RemovedState is not defined for the override
-    # 2. is_menu_item_already_selected function checks if the menu item
-    #    has already been chosen automatically
-    if override["RemovedState"] is not None:
-        if not is_menu_item_already_selected('OverrideRemovedStateId_listbox', override["RemovedState"]):
-            RemovedStateMenu_XPATH = '//span[@aria-owns="OverrideRemovedStateId_listbox"]'
-            try:
-                element = driver.find_element(By.XPATH, RemovedStateMenu_XPATH)
-            except NoSuchElementException as e:
-                exception_name = type(e).__name__
-                logging.info(f"OverrideRemovedStateId_listbox click(): {exception_name}, XPATH = '{RemovedStateMenu_XPATH}'")
-                message_box(msg_title, f'{exception_name}: {RemovedStateMenu_XPATH}', 0)
-                quit()
-            except NoSuchWindowException as e:
-                exception_name = type(e).__name__
-                logging.info(f"OverrideRemovedStateId_listbox click(): {exception_name}, XPATH = '{RemovedStateMenu_XPATH}'")
-                quit()
-            select_menu_item('OverrideRemovedStateId_listbox', override["RemovedState"])
+    fill_text_fields_or_quit({"AdditionalValueAppliedState": override.AdditionalValueAppliedState})
+
+    # select removed state, it is not required if RemovedState is not defined for the override
+    if override.RemovedState is not None:
+        choose_menu_item('OverrideRemovedStateId_listbox', override.RemovedState)
 
     # AdditionalValueRemovedState
-    if override["AdditionalValueRemovedState"] is not None:
-        driver.find_element(By.ID, "AdditionalValueRemovedState").send_keys(override["AdditionalValueRemovedState"])
+    fill_text_fields_or_quit({"AdditionalValueRemovedState": override.AdditionalValueRemovedState})
 
     # press Add button
-    driver.find_element(By.ID, "AddOverrideBtn").click()
+    click_button_or_quit("AddOverrideBtn")
+
+    # the override is added to the grid by an ajax request, the next one is filled only after it is finished,
+    # filling it while the request is still running would be mixed with the form reset by the page
+    if not wait_for_ajax_complete():
+        message_box(msg_title, f"Точка '{override.TagNumber}' не добавлена за {ajax_timeout} секунд, можно нажать "
+                               f"Confirm, чтобы сохранить те точки, которые уже добавлены (проверьте, есть ли "
+                               f"среди них '{override.TagNumber}')", 0)
+        quit()
+
+    if index % log_every == 0 or index == total_count:
+        logging.info("overrides added: %s/%s, last one is '%s'", index, total_count, override.TagNumber)
 
 message_box('WARNING!!!', "Don't press OK UNTIL you press Confirm button!", 0)
 